@@ -3,54 +3,90 @@
 Dieser Service stellt eine einfache REST-API bereit, mit der der Bot gestartet
 und gestoppt werden kann. Außerdem lässt sich ein Backtest auslösen und der
 aktuelle Status abfragen. Die API nutzt den `TradingBot` aus dem
-``bot``-Modul.
+``bot``-Modul. Status und Backtest-Ergebnisse sind als Pydantic-Modelle
+typisiert, sodass FastAPI sie direkt zu JSON serialisiert.
 """
 
 from __future__ import annotations
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+import functools
+
+from fastapi import Depends, FastAPI, HTTPException
+from pydantic import BaseModel, ConfigDict
 
 from bot.bot import TradingBot
 
 
 app = FastAPI(title="Crypto Trading Bot API", version="0.1.0")
 
-# Initialisiere den Trading‑Bot beim Start der API
-bot_instance = TradingBot(config_path="config/config.yaml")
+
+@functools.lru_cache(maxsize=1)
+def get_bot() -> TradingBot:
+    """Liefert die gemeinsame Bot-Instanz; sie wird erst beim ersten Zugriff erzeugt."""
+    return TradingBot(config_path="config/config.yaml")
 
 
 class BacktestRequest(BaseModel):
     num_candles: int = 500
 
 
+class TradeModel(BaseModel):
+    # Erlaubt die direkte Übernahme der ``Trade``-Dataclasses des Bots
+    model_config = ConfigDict(from_attributes=True)
+
+    timestamp: int
+    action: str
+    price: float
+    quantity: float
+
+
+class StatusResponse(BaseModel):
+    running: bool
+    open_position: float | None
+    trade_count: int
+
+
+class BacktestResponse(BaseModel):
+    profit: float
+    trade_count: int
+    trades: list[TradeModel] | None = None
+
+
 @app.get("/")
 def read_root() -> dict[str, str]:
     return {"message": "TradingBot API running"}
 
 
-@app.get("/status")
-def get_status() -> dict:
-    return bot_instance.status()
+@app.get("/status", response_model=StatusResponse)
+def get_status(bot: TradingBot = Depends(get_bot)) -> dict:
+    return bot.status()
 
 
+# Start/Stopp laufen als async-Routen, damit der Bot-Task im Event-Loop des Servers läuft
 @app.post("/start")
-def start_bot() -> dict[str, str]:
-    if bot_instance.status().get("running"):
+async def start_bot(bot: TradingBot = Depends(get_bot)) -> dict[str, str]:
+    if bot.status().get("running"):
         raise HTTPException(status_code=400, detail="Bot already running")
-    bot_instance.start()
+    bot.start()
     return {"message": "Bot started"}
 
 
 @app.post("/stop")
-def stop_bot() -> dict[str, str]:
-    if not bot_instance.status().get("running"):
+async def stop_bot(bot: TradingBot = Depends(get_bot)) -> dict[str, str]:
+    if not bot.status().get("running"):
         raise HTTPException(status_code=400, detail="Bot not running")
-    bot_instance.stop()
+    bot.stop()
     return {"message": "Bot stopped"}
 
 
-@app.post("/backtest")
-def run_backtest(request: BacktestRequest) -> dict:
-    result = bot_instance.backtest(num_candles=request.num_candles)
+@app.post("/backtest", response_model=BacktestResponse, response_model_exclude_none=True)
+def run_backtest(
+    request: BacktestRequest,
+    include_trades: bool = True,
+    bot: TradingBot = Depends(get_bot),
+) -> dict:
+    result = bot.backtest(num_candles=request.num_candles)
+    if not include_trades:
+        # Nur Kennzahlen zurückgeben; die Trade-Liste wird nicht serialisiert
+        result = {"profit": result["profit"], "trade_count": result["trade_count"]}
     return result
\ No newline at end of file
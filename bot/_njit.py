@@ -0,0 +1,24 @@
+"""Optionale Numba-Anbindung.
+
+Ist ``numba`` installiert, wird ``njit`` unverändert weitergereicht. Andernfalls
+liefert der Ersatz-Dekorator die ursprüngliche Python-Funktion zurück, sodass
+die Kernel auch ohne Numba (dann langsamer) lauffähig bleiben.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from numba import njit  # type: ignore[import]
+except ImportError:
+
+    def njit(*args: Any, **kwargs: Any) -> Any:  # type: ignore[no-redef]
+        # Unterstützt sowohl ``@njit`` als auch ``@njit(cache=True)``
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+
+        def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+            return func
+
+        return decorator
@@ -10,32 +10,106 @@ werden; in diesem Beispiel wird sie als Backtest/Paper‑Trading simuliert.
 from __future__ import annotations
 
 import asyncio
-import threading
 import time
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Deque
 
+import numpy as np
 import yaml  # type: ignore
+from numpy.lib.stride_tricks import sliding_window_view
 
+from ._njit import njit
 from .data_handler import DataHandler
-from .strategy import Strategy
+from .strategy import BUY_CODE, SELL_CODE, Strategy
 from .strategies.simple_sma import SimpleSMAStrategy
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Trade:
     """Repräsentiert einen simulierten Trade für Backtests."""
-    timestamp: float
+    timestamp: int  # Unix-Zeit in Sekunden (Livebetrieb) bzw. Kerzenindex (Backtest)
     action: str  # 'BUY' oder 'SELL'
     price: float
     quantity: float
 
 
+# C-basierter YAML-Loader (libyaml), sofern PyYAML damit gebaut wurde
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# Anzahl der im Livebetrieb vorgehaltenen Trades; ältere fallen heraus
+MAX_TRADE_HISTORY = 10_000
+
+
+@njit(cache=True)
+def _backtest_sma_loop(prices_arr, short_w, long_w, sl_mul, tp_mul):  # type: ignore[no-untyped-def]
+    """Backtest-Kernel für die SMA-Strategie.
+
+    Bildet ``SimpleSMAStrategy`` samt Stop-Loss/Take-Profit in einer einzigen
+    Schleife über ein ``float32``-Array nach; laufende Summen und Schwellen
+    werden in ``float64`` geführt. ``sl_mul``/``tp_mul`` sind die Faktoren
+    ``1 - stop_loss_pct`` bzw. ``1 + take_profit_pct``. Der Kernel liefert
+    nur die Kerzenindizes der Trades, in vorab allokierten Arrays; gültig
+    sind jeweils die ersten ``n_buys`` bzw. ``n_sells`` Einträge. Preise und
+    Gewinn ermittelt der Aufrufer aus der ungerundeten Kursreihe.
+
+    Nach der Aufwärmphase ist der Schleifenrumpf verzweigungsfrei: Ein- und
+    Ausstieg werden als 0/1-Masken berechnet und per Multiplikation
+    angewendet, Trade-Slots werden immer beschrieben und nur bei einem
+    Ereignis weitergezählt.
+
+    :return: (n_buys, n_sells, buy_idxs, sell_idxs)
+    """
+    n = prices_arr.shape[0]
+    buy_idxs = np.empty(n, dtype=np.int64)
+    sell_idxs = np.empty(n, dtype=np.int64)
+    n_buys = 0
+    n_sells = 0
+    short_sum = 0.0
+    long_sum = 0.0
+    # 0 = noch kein Zustand, sonst 1 (kurz > lang) bzw. -1
+    last_state = 0
+    in_position = 0
+    sl_level = 0.0
+    tp_level = 0.0
+    for idx in range(n):
+        # float() hebt float32-Kurse auf float64, auch ohne Numba
+        price = float(prices_arr[idx])
+        # Laufende Summen der beiden Fenster aktualisieren
+        if idx >= short_w:
+            short_sum -= float(prices_arr[idx - short_w])
+        if idx >= long_w:
+            long_sum -= float(prices_arr[idx - long_w])
+        short_sum += price
+        long_sum += price
+        if idx + 1 < long_w:
+            # Nicht genügend Daten für beide Durchschnitte
+            continue
+        state = 2 * int(short_sum / short_w > long_sum / long_w) - 1
+        cross = (state - last_state) * int(last_state != 0)
+        signal = np.int8(int(cross > 0) - int(cross < 0))
+        last_state = state
+        # Einstieg: Schwellen werden einmalig beim Eröffnen berechnet
+        enter = int(signal == BUY_CODE) * (1 - in_position)
+        keep = 1 - enter
+        sl_level = price * sl_mul * enter + sl_level * keep
+        tp_level = price * tp_mul * enter + tp_level * keep
+        buy_idxs[n_buys] = idx
+        n_buys += enter
+        held = in_position + enter
+        # Ausstieg per Verkaufssignal, Stop-Loss oder Take-Profit
+        exit_mask = held * int((signal == SELL_CODE) | (price <= sl_level) | (price >= tp_level))
+        sell_idxs[n_sells] = idx
+        n_sells += exit_mask
+        in_position = held - exit_mask
+    return n_buys, n_sells, buy_idxs, sell_idxs
+
+
 class TradingBot:
     def __init__(self, config_path: str = "config/config.yaml") -> None:
         # Lade Konfiguration
         with open(config_path, "r", encoding="utf-8") as f:
-            config = yaml.safe_load(f)
+            config = yaml.load(f, Loader=_YAML_LOADER)
         api_key = config.get("api_key")
         api_secret = config.get("api_secret")
         self.symbol: str = config.get("symbol", "BTCUSDT")
@@ -45,98 +119,145 @@ class TradingBot:
         self.stop_loss_pct: float = float(risk_cfg.get("stop_loss_pct", 0.02))
         self.take_profit_pct: float = float(risk_cfg.get("take_profit_pct", 0.03))
         self.max_position_size: float = float(risk_cfg.get("max_position_size", 0.1))
-        strategy_cfg = config.get("strategy", {})
-        strategy_type = strategy_cfg.get("type", "sma")
+        # Konstante Faktoren für die Stop-Loss/Take-Profit-Schwellen
+        self._sl_mul = 1 - self.stop_loss_pct
+        self._tp_mul = 1 + self.take_profit_pct
+        self._strategy_cfg: Dict[str, Any] = config.get("strategy", {})
         # Initialisiere Strategie
-        if strategy_type == "sma":
-            self.strategy: Strategy = SimpleSMAStrategy(
-                short_window=int(strategy_cfg.get("short_window", 7)),
-                long_window=int(strategy_cfg.get("long_window", 25)),
-            )
-        else:
-            raise ValueError(f"Unbekannter Strategie-Typ: {strategy_type}")
+        self.strategy: Strategy = self._create_strategy()
+        # Kurshistorie des Livebetriebs als Ringpuffer; neue Kurse überschreiben die ältesten
+        self._price_cap = max(1000, 2 * getattr(self.strategy, "long_window", 25))
+        self._buf = np.empty(self._price_cap, dtype=np.float64)
+        self._head = 0  # nächste Schreibposition
+        self._n = 0  # Anzahl gültiger Einträge
         # Datenhandler initialisieren
         self.data_handler = DataHandler(api_key=api_key, api_secret=api_secret)
         # Laufstatus
         self._running = False
-        self._thread: Optional[threading.Thread] = None
+        self._task: Optional[asyncio.Task[None]] = None
         # Aktueller Trade-Status
         self.position: Optional[Trade] = None
-        self.trade_history: List[Trade] = []
+        # Ausstiegsschwellen der offenen Position, berechnet beim Einstieg
+        self._sl_level = 0.0
+        self._tp_level = 0.0
+        self.trade_history: Deque[Trade] = deque(maxlen=MAX_TRADE_HISTORY)
+        self._total_trades = 0
+
+    def _create_strategy(self) -> Strategy:
+        """Erzeugt eine frische Strategie-Instanz gemäß Konfiguration."""
+        strategy_cfg = self._strategy_cfg
+        strategy_type = strategy_cfg.get("type", "sma")
+        if strategy_type == "sma":
+            return SimpleSMAStrategy(
+                short_window=int(strategy_cfg.get("short_window", 7)),
+                long_window=int(strategy_cfg.get("long_window", 25)),
+            )
+        raise ValueError(f"Unbekannter Strategie-Typ: {strategy_type}")
 
     def start(self) -> None:
-        """Startet den Bot in einem separaten Thread."""
+        """Startet den Bot als Task im laufenden Event-Loop.
+
+        Muss aus einem laufenden Event-Loop heraus aufgerufen werden, z. B. aus
+        einer ``async``-Route der API.
+        """
         if self._running:
             return
         self._running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        self._task = asyncio.get_running_loop().create_task(self._run_loop_async())
 
     def stop(self) -> None:
         """Stoppt den Bot."""
         self._running = False
-        if self._thread and self._thread.is_alive():
-            self._thread.join(timeout=5)
-        self._thread = None
+        if self._task is not None:
+            self._task.cancel()
+        self._task = None
 
     def status(self) -> Dict[str, Any]:
         """Gibt den aktuellen Status des Bots zurück."""
         return {
             "running": self._running,
             "open_position": self.position.price if self.position else None,
-            "trade_count": len(self.trade_history),
+            "trade_count": self._total_trades,
         }
 
-    def _run_loop(self) -> None:
-        """Interne Schleife für den Livebetrieb."""
-        prices: List[float] = []
-        while self._running:
-            # Neue Daten abrufen
-            price = self.data_handler.get_current_price(self.symbol)
-            prices.append(price)
-            # Limitieren der gespeicherten Preise für Ressourceneffizienz
-            if len(prices) > max(1000, 2 * getattr(self.strategy, 'long_window', 25)):
-                prices = prices[-max(1000, 2 * getattr(self.strategy, 'long_window', 25)) :]
-            # Handelsentscheidung treffen
-            signal = self.strategy.generate_signal(prices)
-            # Simulierte Orderausführung
-            if signal == "BUY" and self.position is None:
-                # Eröffne Position
-                quantity = self.base_asset_amount
-                self.position = Trade(time.time(), "BUY", price, quantity)
-                self.trade_history.append(self.position)
-            elif signal == "SELL" and self.position is not None:
-                # Schließe Position
-                sell_trade = Trade(time.time(), "SELL", price, self.position.quantity)
-                self.trade_history.append(sell_trade)
+    def get_tail(self, k: int) -> np.ndarray:
+        """Gibt die letzten ``k`` Livekurse zurück (ältester zuerst)."""
+        k = min(k, self._n)
+        start = self._head - k
+        if start >= 0:
+            return self._buf[start : self._head].copy()
+        # Der Ausschnitt läuft über das Pufferende hinaus
+        return np.concatenate((self._buf[start:], self._buf[: self._head]))
+
+    async def _run_loop_async(self) -> None:
+        """Verarbeitet die per Stream gelieferten Kurse, bis der Bot gestoppt wird."""
+        try:
+            await self.data_handler.stream_prices(self.symbol, self.interval, self._on_price)
+        except Exception as err:
+            print(f"Livebetrieb wegen eines Fehlers beendet: {err}")
+        finally:
+            # Nur zurücksetzen, wenn nicht inzwischen ein neuer Lauf gestartet wurde
+            if self._task is asyncio.current_task():
+                self._running = False
+                self._task = None
+
+    def _record_trade(self, trade: Trade) -> None:
+        """Übernimmt einen Trade in die (begrenzte) Historie und zählt ihn."""
+        self.trade_history.append(trade)
+        self._total_trades += 1
+
+    def _on_price(self, price: float) -> None:
+        """Verarbeitet einen neuen Schlusskurs im Livebetrieb."""
+        self._buf[self._head] = price
+        self._head = (self._head + 1) % self._price_cap
+        if self._n < self._price_cap:
+            self._n += 1
+        # Handelsentscheidung treffen (die Strategie verarbeitet nur den neuen Kurs)
+        signal = self.strategy.update(price)
+        # Simulierte Orderausführung
+        if signal == "BUY" and self.position is None:
+            # Eröffne Position
+            quantity = self.base_asset_amount
+            self.position = Trade(int(time.time()), "BUY", price, quantity)
+            self._sl_level = price * self._sl_mul
+            self._tp_level = price * self._tp_mul
+            self._record_trade(self.position)
+        elif signal == "SELL" and self.position is not None:
+            # Schließe Position
+            sell_trade = Trade(int(time.time()), "SELL", price, self.position.quantity)
+            self._record_trade(sell_trade)
+            self.position = None
+        # Füge Stop-Loss/Take-Profit hinzu
+        if self.position:
+            if price <= self._sl_level:
+                # Stop-Loss auslösen
+                sell_trade = Trade(int(time.time()), "SELL", price, self.position.quantity)
+                self._record_trade(sell_trade)
+                self.position = None
+            elif price >= self._tp_level:
+                # Take-Profit auslösen
+                sell_trade = Trade(int(time.time()), "SELL", price, self.position.quantity)
+                self._record_trade(sell_trade)
                 self.position = None
-            # Füge Stop-Loss/Take-Profit hinzu
-            if self.position:
-                entry_price = self.position.price
-                if price <= entry_price * (1 - self.stop_loss_pct):
-                    # Stop-Loss auslösen
-                    sell_trade = Trade(time.time(), "SELL", price, self.position.quantity)
-                    self.trade_history.append(sell_trade)
-                    self.position = None
-                elif price >= entry_price * (1 + self.take_profit_pct):
-                    # Take-Profit auslösen
-                    sell_trade = Trade(time.time(), "SELL", price, self.position.quantity)
-                    self.trade_history.append(sell_trade)
-                    self.position = None
-            # Warte ein wenig, um API-Limitierung zu vermeiden
-            time.sleep(5)
 
     def backtest(self, num_candles: int = 500) -> Dict[str, Any]:
         """Führt einen einfachen Backtest durch und gibt Performance-Kennzahlen aus."""
         prices = self.data_handler.get_recent_prices(self.symbol, self.interval, limit=num_candles)
+        # Eigene Strategie-Instanz, damit der Zustand des Livebetriebs unberührt bleibt
+        strategy = self._create_strategy()
+        if isinstance(strategy, SimpleSMAStrategy):
+            return self._backtest_sma(prices, strategy)
         position: Optional[Trade] = None
+        sl_level = tp_level = 0.0
         profit = 0.0
         trades = []
         for idx, price in enumerate(prices):
-            window_prices = prices[: idx + 1]
-            signal = self.strategy.generate_signal(window_prices)
+            # Kurse einzeln einspeisen statt wachsender Präfix-Kopien
+            signal = strategy.update(price)
             if signal == "BUY" and position is None:
                 position = Trade(idx, "BUY", price, self.base_asset_amount)
+                sl_level = price * self._sl_mul
+                tp_level = price * self._tp_mul
                 trades.append(position)
             elif signal == "SELL" and position is not None:
                 # Realisiere Gewinn
@@ -147,12 +268,12 @@ class TradingBot:
             # Stop-Loss/Take-Profit
             if position:
                 entry = position.price
-                if price <= entry * (1 - self.stop_loss_pct):
+                if price <= sl_level:
                     trade = Trade(idx, "SELL", price, position.quantity)
                     trades.append(trade)
                     profit += (price - entry) * position.quantity
                     position = None
-                elif price >= entry * (1 + self.take_profit_pct):
+                elif price >= tp_level:
                     trade = Trade(idx, "SELL", price, position.quantity)
                     trades.append(trade)
                     profit += (price - entry) * position.quantity
@@ -161,4 +282,95 @@ class TradingBot:
             "profit": profit,
             "trade_count": len(trades),
             "trades": trades,
-        }
\ No newline at end of file
+        }
+
+    def _backtest_sma(self, prices: np.ndarray, strategy: SimpleSMAStrategy) -> Dict[str, Any]:
+        """Backtest der SMA-Strategie über den kompilierten Kernel."""
+        prices = np.asarray(prices, dtype=np.float64)
+        # Nur die Signalberechnung läuft auf float32; Preise und Gewinn stammen aus der float64-Reihe
+        n_buys, n_sells, buy_idxs, sell_idxs = _backtest_sma_loop(
+            np.ascontiguousarray(prices, dtype=np.float32),
+            strategy.short_window,
+            strategy.long_window,
+            self._sl_mul,
+            self._tp_mul,
+        )
+        return self._backtest_result(prices, buy_idxs[:n_buys], sell_idxs[:n_sells])
+
+    def _backtest_result(self, prices: np.ndarray, buy_idxs: np.ndarray, sell_idxs: np.ndarray) -> Dict[str, Any]:
+        """Erzeugt Trades und Gewinn aus den Indizes abwechselnder Käufe und Verkäufe."""
+        qty = self.base_asset_amount
+        entry_px = prices[buy_idxs[: len(sell_idxs)]]
+        profit = float(((prices[sell_idxs] - entry_px) * qty).sum())
+        # Trade-Objekte erst nach der heißen Schleife erzeugen; Käufe und Verkäufe wechseln sich ab
+        trades: List[Trade] = []
+        for i, buy in enumerate(buy_idxs.tolist()):
+            trades.append(Trade(buy, "BUY", float(prices[buy]), qty))
+            if i < len(sell_idxs):
+                sell = int(sell_idxs[i])
+                trades.append(Trade(sell, "SELL", float(prices[sell]), qty))
+        return {
+            "profit": profit,
+            "trade_count": len(trades),
+            "trades": trades,
+        }
+
+    def backtest_vectorized(self, num_candles: int = 500) -> Dict[str, Any]:
+        """Backtest der SMA-Strategie mit vektorisierten NumPy-Operationen.
+
+        Gleitende Durchschnitte und Kreuzungen werden für die gesamte Historie
+        auf einmal berechnet; Python-Code läuft nur noch pro Trade, nicht pro
+        Kerze. Das Ergebnis entspricht `backtest` bis auf Rundungsunterschiede
+        bei praktisch gleichen Durchschnitten.
+        """
+        strategy = self._create_strategy()
+        if not isinstance(strategy, SimpleSMAStrategy):
+            raise ValueError("Der vektorisierte Backtest unterstützt nur die SMA-Strategie")
+        prices = np.asarray(
+            self.data_handler.get_recent_prices(self.symbol, self.interval, limit=num_candles),
+            dtype=np.float64,
+        )
+        # Signale auf float32 wie im Kernel; Preise und Gewinn aus der float64-Reihe
+        prices32 = prices.astype(np.float32)
+        short_w, long_w = strategy.short_window, strategy.long_window
+        n = len(prices)
+        if n <= long_w:
+            # Zu wenige Kerzen für eine Kreuzung
+            return {"profit": 0.0, "trade_count": 0, "trades": []}
+        # Durchschnitte ab Kerze long_w - 1, beide am Fensterende ausgerichtet
+        # Summiert wird in float64
+        long_ma = sliding_window_view(prices32, long_w).mean(axis=1, dtype=np.float64)
+        short_ma = sliding_window_view(prices32, short_w).mean(axis=1, dtype=np.float64)[long_w - short_w :]
+        state = np.where(short_ma > long_ma, 1, -1).astype(np.int8)
+        # crossings[i] gehört zu Kerze long_w + i
+        crossings = np.diff(state)
+        buys = np.flatnonzero(crossings > 0) + long_w
+        sells = np.flatnonzero(crossings < 0) + long_w
+
+        # Stop-Loss/Take-Profit pro Trade: erster Ausstieg zwischen Einstieg und nächstem Verkaufssignal
+        entries: List[int] = []
+        exits: List[int] = []
+        next_free = 0
+        for buy in buys:
+            if buy < next_free:
+                # Position war zu diesem Zeitpunkt noch offen
+                continue
+            entries.append(int(buy))
+            j = np.searchsorted(sells, buy)
+            end = sells[j] + 1 if j < len(sells) else n
+            entry = float(prices32[buy])
+            segment = prices32[buy:end].astype(np.float64)
+            hits = np.flatnonzero((segment <= entry * self._sl_mul) | (segment >= entry * self._tp_mul))
+            if len(hits):
+                exit_idx = int(buy + hits[0])
+            elif j < len(sells):
+                exit_idx = int(sells[j])
+            else:
+                # Position bleibt bis zum Ende offen
+                break
+            exits.append(exit_idx)
+            next_free = exit_idx + 1
+
+        return self._backtest_result(
+            prices, np.asarray(entries, dtype=np.int64), np.asarray(exits, dtype=np.int64)
+        )
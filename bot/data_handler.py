@@ -3,33 +3,84 @@
 Dieses Modul kapselt die Kommunikation mit der Binance API. Für einfaches
 Testing ohne echten API‑Key kann der DataHandler im `paper`‑Modus
 initialisiert werden; in diesem Fall werden zufällige Daten generiert.
+
+Abgerufene Klines werden pro Zeitintervall-Bucket auf der Platte
+(``.cache/klines``) und zusätzlich im Prozess zwischengespeichert, sodass
+wiederholte Backtests mit gleichen Parametern keine Netzwerkanfrage auslösen.
+Kurse werden als ``float64`` geliefert, damit Trades exakte Börsenkurse
+ausweisen; nur die Backtest-Kernel rechnen intern auf ``float32``.
+Für den Livebetrieb liefert `stream_prices` Schlusskurse per WebSocket.
 """
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import os
-import random
+import tempfile
+import time
 from datetime import datetime
-from typing import List, Dict, Any
+from pathlib import Path
+from typing import Callable, Dict, Any
+
+import numpy as np
 
 try:
     from binance.client import Client  # type: ignore[import]
+    from binance import AsyncClient, BinanceSocketManager  # type: ignore[import]
 except ImportError:
     Client = None  # type: ignore
+    AsyncClient = None  # type: ignore
+    BinanceSocketManager = None  # type: ignore
+
+# Abstand der Pseudokurse im Papiermodus (Sekunden)
+PAPER_TICK_SECONDS = 5
+
+
+# Sekunden pro Einheit der Binance-Intervallangaben ('1m', '4h', '1d', ...)
+_INTERVAL_UNITS: Dict[str, int] = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800, "M": 2592000}
+
+
+def _interval_seconds(interval: str) -> int:
+    """Rechnet ein Binance-Intervall wie '1m' oder '4h' in Sekunden um."""
+    try:
+        return int(interval[:-1]) * _INTERVAL_UNITS[interval[-1]]
+    except (KeyError, ValueError):
+        return 60
 
 
 class DataHandler:
     """Beschafft Marktdaten von Binance oder generiert Testdaten."""
 
+    _cache_dir = Path(".cache/klines")
+
     def __init__(self, api_key: str | None = None, api_secret: str | None = None) -> None:
         self.api_key = api_key or os.getenv("BINANCE_API_KEY")
         self.api_secret = api_secret or os.getenv("BINANCE_API_SECRET")
-        self.client: Any | None = None
-        if self.api_key and self.api_secret and Client is not None:
-            # Initialisiere echten Binance Client
-            self.client = Client(self.api_key, self.api_secret)
+        # Der Binance-Client wird erst bei Bedarf erzeugt (siehe `client`)
+        self._client: Any | None = None
+        # Zufallsgenerator für Pseudodaten im Papiermodus
+        self._rng = np.random.default_rng()
+        # In-Process-Cache vor dem Plattencache für wiederholte Anfragen
+        self._cached_closes = functools.lru_cache(maxsize=32)(self._load_closes)
+
+    @property
+    def has_api_access(self) -> bool:
+        """Gibt an, ob Zugangsdaten und die Binance-Bibliothek vorhanden sind."""
+        return bool(self.api_key and self.api_secret) and Client is not None
+
+    @property
+    def client(self) -> Any | None:
+        """Binance-Client, der beim ersten Zugriff erzeugt wird.
 
-    def get_recent_prices(self, symbol: str, interval: str, limit: int = 50) -> List[float]:
+        Der Konstruktor von ``Client`` kontaktiert die API; schlägt das fehl,
+        wird es beim nächsten Zugriff erneut versucht.
+        """
+        if self._client is None and self.has_api_access:
+            self._client = Client(self.api_key, self.api_secret)
+        return self._client
+
+    def get_recent_prices(self, symbol: str, interval: str, limit: int = 50) -> np.ndarray:
         """Ruft die letzten Schlusskurse für ein Symbol ab.
 
         Falls kein API‑Key gesetzt ist, werden zufällige Preise generiert.
@@ -37,22 +88,118 @@ class DataHandler:
         :param symbol: Handels­paar (z. B. 'BTCUSDT')
         :param interval: Zeitintervall (z. B. '1m', '5m', '1h')
         :param limit: Anzahl der zurückzugebenden Kerzen
-        :return: Liste von Schlusskursen
+        :return: Array von Schlusskursen (schreibgeschützt, da ggf. zwischengespeichert)
         """
-        if self.client:
-            # hole Klines via Binance API
+        if self.has_api_access:
+            # hole Klines via Cache bzw. Binance API
             try:
-                klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit)
-                closes = [float(candle[4]) for candle in klines]
-                return closes
+                bucket = int(time.time() // _interval_seconds(interval))
+                return self._cached_closes(symbol, interval, limit, bucket)
             except Exception as err:
                 # Fallback: generiere Zufallsdaten
                 print(f"Fehler beim Abrufen der Binance-Daten: {err}. Verwende Zufallsdaten.")
-        # Generiere Pseudodaten für Tests
-        base_price = random.uniform(10000, 40000)
-        return [base_price + random.gauss(0, base_price * 0.01) for _ in range(limit)]
+        return self._random_prices(limit)
 
     def get_current_price(self, symbol: str) -> float:
         """Gibt den aktuellen Preis für das Symbol zurück (letzter Schlusskurs)."""
-        prices = self.get_recent_prices(symbol, interval="1m", limit=1)
-        return prices[-1] if prices else 0.0
\ No newline at end of file
+        if self.has_api_access:
+            # Der aktuelle Kurs wird bewusst am Cache vorbei abgerufen
+            try:
+                prices = self._fetch_closes(symbol, interval="1m", limit=1)
+                return float(prices[-1]) if len(prices) else 0.0
+            except Exception as err:
+                print(f"Fehler beim Abrufen der Binance-Daten: {err}. Verwende Zufallsdaten.")
+        return float(self._random_prices(1)[-1])
+
+    async def stream_prices(self, symbol: str, interval: str, callback: Callable[[float], None]) -> None:
+        """Übergibt den Schlusskurs jeder abgeschlossenen Kerze an ``callback``.
+
+        Die Kurse kommen per Binance-WebSocket (Kline-Stream). Ohne API-Zugang
+        wird stattdessen alle ``PAPER_TICK_SECONDS`` ein Pseudokurs erzeugt.
+        Die Methode läuft, bis der umgebende Task abgebrochen wird.
+
+        :param symbol: Handels­paar (z. B. 'BTCUSDT')
+        :param interval: Zeitintervall der Kerzen (z. B. '1m')
+        :param callback: wird mit jedem neuen Schlusskurs aufgerufen
+        """
+        if not self.has_api_access or AsyncClient is None:
+            while True:
+                callback(self.get_current_price(symbol))
+                await asyncio.sleep(PAPER_TICK_SECONDS)
+        client = await AsyncClient.create(self.api_key, self.api_secret)
+        try:
+            socket_manager = BinanceSocketManager(client)
+            async with socket_manager.kline_socket(symbol, interval=interval) as stream:
+                while True:
+                    msg = await stream.recv()
+                    if msg.get("e") == "error":
+                        raise ConnectionError(f"Fehler im Binance-Kline-Stream: {msg.get('m')}")
+                    kline = msg["k"]
+                    # Nur abgeschlossene Kerzen auswerten
+                    if kline["x"]:
+                        callback(float(kline["c"]))
+        finally:
+            await client.close_connection()
+
+    def _random_prices(self, limit: int) -> np.ndarray:
+        """Generiert Pseudodaten für Tests."""
+        base_price = self._rng.uniform(10000, 40000)
+        # Negative Anzahlen liefern wie range(limit) eine leere Reihe
+        return self._rng.normal(base_price, base_price * 0.01, size=max(limit, 0))
+
+    def _fetch_closes(self, symbol: str, interval: str, limit: int) -> np.ndarray:
+        """Holt Schlusskurse direkt über die Binance API."""
+        klines = self.client.get_klines(symbol=symbol, interval=interval, limit=limit)  # type: ignore[union-attr]
+        # Schlusskurse direkt in einen float64-Puffer schreiben, ohne Zwischenliste
+        return np.fromiter((candle[4] for candle in klines), dtype=np.float64, count=len(klines))
+
+    def _load_closes(self, symbol: str, interval: str, limit: int, bucket: int) -> np.ndarray:
+        """Lädt Schlusskurse aus dem Plattencache oder ruft sie ab und speichert sie.
+
+        :param bucket: Index des aktuellen Zeitintervalls; ein neuer Bucket
+            bedeutet eine neue Kerze und damit einen neuen Cache-Eintrag.
+        """
+        prefix = f"{symbol}_{interval}_{limit}_"
+        path = self._cache_dir / f"{prefix}{bucket}.npy"
+        closes = self._read_cache(path)
+        if closes is None:
+            closes = self._fetch_closes(symbol, interval, limit)
+            self._write_cache(prefix, path, closes)
+        # Zwischengespeicherte Arrays werden geteilt und dürfen nicht verändert werden
+        closes.flags.writeable = False
+        return closes
+
+    @staticmethod
+    def _read_cache(path: Path) -> np.ndarray | None:
+        """Liest einen Cache-Eintrag; fehlende oder defekte Dateien gelten als Fehlschlag."""
+        try:
+            return np.load(path)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError) as err:
+            print(f"Kline-Cache {path} ist nicht lesbar: {err}. Lade Daten neu.")
+            return None
+
+    def _write_cache(self, prefix: str, path: Path, closes: np.ndarray) -> None:
+        """Schreibt einen Cache-Eintrag atomar und entfernt veraltete Buckets."""
+        tmp_name: str | None = None
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            for stale in self._cache_dir.glob(f"{prefix}*.npy"):
+                if stale != path:
+                    stale.unlink(missing_ok=True)
+            # Eindeutige Temporärdatei, damit parallele Schreiber sich nicht überschreiben
+            fd, tmp_name = tempfile.mkstemp(dir=self._cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, closes)
+            os.replace(tmp_name, path)
+            tmp_name = None
+        except OSError as err:
+            # Ein nicht beschreibbarer Cache darf den Abruf nicht verhindern
+            print(f"Kline-Cache konnte nicht geschrieben werden: {err}")
+        finally:
+            if tmp_name is not None:
+                try:
+                    os.unlink(tmp_name)
+                except OSError:
+                    pass
\ No newline at end of file
@@ -5,13 +5,68 @@ Durchschnitt. Wenn der kurze Durchschnitt den langen von unten nach oben
 kreuzt, wird ein Kaufsignal ('BUY') generiert. Wenn der kurze den langen von
 oben nach unten kreuzt, wird ein Verkaufssignal ('SELL') generiert. Ansonsten
 wird 'HOLD' zurückgegeben.
+
+Beide Durchschnitte werden als laufende Summen geführt: pro neuem Kurs wird
+der herausfallende Wert abgezogen und der neue addiert, sodass jeder Schritt
+O(1) kostet. Der Schritt selbst ist ein pro Fensterpaar spezialisierter
+Numba-Kernel (siehe `_make_stepper`).
 """
 
 from __future__ import annotations
 
-from typing import List
+import functools
+from typing import Any, Callable, List
+
+import numpy as np
+
+from .._njit import njit
+from ..strategy import BUY_CODE, HOLD_CODE, SELL_CODE, SIGNAL_NAMES, Strategy
+
+
+@functools.lru_cache(maxsize=None)
+def _make_stepper(short_window: int, long_window: int) -> Callable[..., Any]:
+    """Erzeugt einen auf feste Fenstergrößen spezialisierten SMA-Schritt.
+
+    Die Fenstergrößen werden als Closure-Konstanten eingebettet, sodass Numba
+    pro Fensterpaar einen eigenen Kernel mit festen Werten übersetzt. Der
+    Cache sorgt dafür, dass jedes Paar nur einmal kompiliert wird.
+
+    Der Zustand liegt in den übergebenen Arrays: ``window`` ist ein Ringpuffer
+    der letzten ``long_window`` Kurse, ``sums`` enthält die kurze und lange
+    laufende Summe, ``meta`` Schreibposition, Füllstand und letzten
+    Kreuzungszustand.
+    """
+
+    @njit
+    def step(window, sums, meta, price):  # type: ignore[no-untyped-def]
+        head = meta[0]
+        count = meta[1]
+        # Herausfallende Kurse aus den laufenden Summen entfernen
+        if count == long_window:
+            sums[1] -= window[head]
+        if count >= short_window:
+            sums[0] -= window[(head + long_window - short_window) % long_window]
+        window[head] = price
+        meta[0] = (head + 1) % long_window
+        sums[0] += price
+        sums[1] += price
+        if count < long_window:
+            count += 1
+            meta[1] = count
+        if count < long_window:
+            # Nicht genügend Daten für beide Durchschnitte
+            return np.int8(HOLD_CODE)
+
+        # Setze aktuellen Zustand: 1 wenn kurz > lang, -1 wenn kurz < lang
+        current_state = 1 if sums[0] / short_window > sums[1] / long_window else -1
+        last_state = meta[2]
+        meta[2] = current_state
+        if last_state == 0 or current_state == last_state:
+            return np.int8(HOLD_CODE)
+        # Kreuzt von unten nach oben -> Kauf, von oben nach unten -> Verkauf
+        return np.int8(BUY_CODE if current_state > last_state else SELL_CODE)
 
-from ..strategy import Strategy
+    return step
 
 
 class SimpleSMAStrategy(Strategy):
@@ -21,30 +76,22 @@ class SimpleSMAStrategy(Strategy):
             raise ValueError("long_window muss größer sein als short_window")
         self.short_window = short_window
         self.long_window = long_window
-        # Speichern des letzten Zustands (ob kurz über lang war), um Kreuzungen zu erkennen
-        self._last_cross_state: int | None = None
+        self._step = _make_stepper(short_window, long_window)
+        self.reset()
+
+    def reset(self) -> None:
+        # Ringpuffer der letzten `long_window` Kurse; das kurze Fenster ist dessen Ende
+        self._window = np.zeros(self.long_window, dtype=np.float64)
+        # Laufende Summen: [kurz, lang]
+        self._sums = np.zeros(2, dtype=np.float64)
+        # [Schreibposition, Füllstand, letzter Kreuzungszustand (0 = noch keiner)]
+        self._meta = np.zeros(3, dtype=np.int64)
 
-    def _moving_average(self, data: List[float], window: int) -> float:
-        return sum(data[-window:]) / window
+    def update(self, price: float) -> str:
+        return SIGNAL_NAMES[int(self._step(self._window, self._sums, self._meta, float(price)))]
 
     def generate_signal(self, prices: List[float]) -> str:
-        if len(prices) < self.long_window:
-            # Nicht genügend Daten für beide Durchschnitte
+        # Die Strategie ist inkrementell: pro Aufruf wird nur der jüngste Kurs verarbeitet
+        if not len(prices):
             return "HOLD"
-
-        short_ma = self._moving_average(prices, self.short_window)
-        long_ma = self._moving_average(prices, self.long_window)
-
-        # Setze aktuellen Zustand: 1 wenn kurz > lang, -1 wenn kurz < lang
-        current_state = 1 if short_ma > long_ma else -1
-        signal = "HOLD"
-        if self._last_cross_state is not None:
-            if current_state > self._last_cross_state:
-                # Kreuzt von unten nach oben -> Kauf
-                signal = "BUY"
-            elif current_state < self._last_cross_state:
-                # Kreuzt von oben nach unten -> Verkauf
-                signal = "SELL"
-        # Aktualisiere den Zustand für das nächste Mal
-        self._last_cross_state = current_state
-        return signal
\ No newline at end of file
+        return self.update(prices[-1])
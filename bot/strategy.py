@@ -4,23 +4,108 @@ Strategien implementieren die Methode `generate_signal`, die anhand der
 übergebenen Preisdaten entscheidet, ob eine Position eröffnet, geschlossen
 oder gehalten werden soll. Signale werden als Strings 'BUY', 'SELL' oder
 'HOLD' repräsentiert.
+
+Der Bot füttert Strategien über `update` mit jeweils einem neuen Kurs.
+Strategien, die ihren Zustand inkrementell führen können, überschreiben
+`update` direkt; die Standardimplementierung sammelt die Kurse und ruft
+`generate_signal` mit der bisherigen Historie auf.
+
+Reine Strategien (``PURE = True``), deren Signal ausschließlich von den
+letzten ``lookback`` Kursen abhängt, erhalten automatisch einen LRU-Cache für
+`generate_signal`, der nach dem Inhalt dieses Kursfensters schlüsselt.
 """
 
 from __future__ import annotations
 
-from typing import List
+import functools
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+# Signalcodes für kompilierte Kernel (int8 statt Strings)
+HOLD_CODE = 0
+BUY_CODE = 1
+SELL_CODE = -1
+
+SIGNAL_NAMES: Dict[int, str] = {HOLD_CODE: "HOLD", BUY_CODE: "BUY", SELL_CODE: "SELL"}
+
+# Anzahl zwischengespeicherter Signale pro Strategie-Instanz
+SIGNAL_CACHE_SIZE = 4096
+
+
+def memoize_by_tail(func: Callable[..., str]) -> Callable[..., str]:
+    """Puffert `generate_signal` einer reinen Strategie nach ihrem Kursfenster.
+
+    Schlüssel sind die Rohbytes der letzten ``lookback`` Kurse als ``float64``;
+    die Strategie erhält bei einem Cache-Fehlschlag genau dieses Fenster als
+    neue Liste. Bei zu kurzer Historie wird ohne Cache mit einer Kopie der
+    Kurse gerechnet.
+    """
+
+    @functools.wraps(func)
+    def wrapper(self: "Strategy", prices: List[float]) -> str:
+        n = self.lookback
+        if n <= 0:
+            return func(self, prices)
+        if len(prices) < n:
+            # Auch in der Aufwärmphase eine eigene Liste übergeben (höchstens `lookback` Kurse)
+            return func(self, [float(price) for price in prices])
+        # Pro Instanz (Signal hängt von den Parametern ab) und pro Funktion, damit
+        # Unterklassen, die super().generate_signal aufrufen, eigene Caches haben
+        caches = self.__dict__.setdefault("_signal_caches", {})
+        cache = caches.get(func)
+        if cache is None:
+            cache = functools.lru_cache(maxsize=SIGNAL_CACHE_SIZE)(
+                lambda key: func(self, np.frombuffer(key, dtype=np.float64).tolist())
+            )
+            caches[func] = cache
+        return cache(np.asarray(prices[-n:], dtype=np.float64).tobytes())
+
+    return wrapper
 
 
 class Strategy:
     """Basisklasse für eine Handelsstrategie."""
 
+    # Maximale Anzahl Kurse, die die Standardimplementierung von `update` vorhält
+    history_size: int = 1000
+    # Signal hängt nur von den letzten `lookback` Kursen ab und wird zwischengespeichert
+    PURE: bool = False
+    lookback: int = 0
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        if cls.PURE and "generate_signal" in cls.__dict__:
+            cls.generate_signal = memoize_by_tail(cls.__dict__["generate_signal"])  # type: ignore[method-assign]
+
     def __init__(self, **params: float) -> None:
         self.params = params
+        self._history: List[float] = []
 
     def generate_signal(self, prices: List[float]) -> str:
         """Erzeugt ein Handelssignal.
 
+        Reine Strategien (``PURE = True``) erhalten stets eine eigene Liste;
+        sobald genügend Kurse vorliegen, enthält sie nur die letzten
+        ``lookback`` Kurse.
+
         :param prices: Liste historischer Schlusskurse (jüngster Preis am Ende)
         :return: 'BUY', 'SELL' oder 'HOLD'
         """
-        raise NotImplementedError("generate_signal muss in Unterklassen implementiert werden")
\ No newline at end of file
+        raise NotImplementedError("generate_signal muss in Unterklassen implementiert werden")
+
+    def update(self, price: float) -> str:
+        """Verarbeitet einen neuen Schlusskurs und erzeugt ein Handelssignal.
+
+        :param price: jüngster Schlusskurs
+        :return: 'BUY', 'SELL' oder 'HOLD'
+        """
+        self._history.append(price)
+        # Historie begrenzen; gekürzt wird nur gelegentlich, damit das Kopieren amortisiert O(1) bleibt
+        if len(self._history) > 2 * self.history_size:
+            del self._history[: -self.history_size]
+        return self.generate_signal(self._history)
+
+    def reset(self) -> None:
+        """Setzt den internen Zustand der Strategie zurück."""
+        self._history = []